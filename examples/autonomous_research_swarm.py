@@ -2,12 +2,16 @@
 """Autonomous AI Multi-Agent Systems Research - 20 Parallel Workers"""
 
 import asyncio
-import json
+import hashlib
 import os
+import re
+import time
+from collections import Counter
 from datetime import datetime
 from typing import List, Dict, Any
 import aiohttp
-from tavily import TavilyClient
+import orjson
+from bleeding_edge_common import TAVILY_SEM, read_cache, run, write_bytes, write_cache
 
 # Research topics for 20 parallel workers
 RESEARCH_TOPICS = [
@@ -33,11 +37,58 @@ RESEARCH_TOPICS = [
     "Autonomous AI systems Temporal case studies"
 ]
 
+# Key concepts looked for in each worker's sources
+KEY_CONCEPTS = (
+    "Temporal workflows",
+    "Durable execution",
+    "Agent orchestration",
+    "Crash recovery",
+    "Multi-agent systems",
+    "AI agents",
+    "Event sourcing",
+    "State management",
+    "Persistence",
+    "Coordination",
+)
+_KEY_CONCEPTS_LC = tuple((c, c.lower()) for c in KEY_CONCEPTS)
+_CONCEPT_RE = re.compile(r'(?i)\b(' + '|'.join(re.escape(c) for c in KEY_CONCEPTS) + r')\b')
+
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+REPORTS_DIR = "/adapt/projects/firebird/reports"
+CACHE_DIR = f"{REPORTS_DIR}/.cache"
+os.makedirs(CACHE_DIR, exist_ok=True)
+
+# Reports are compact JSON unless FIREBIRD_PRETTY=1 asks for human-readable output
+_JSON_OPTIONS = orjson.OPT_INDENT_2 if os.environ.get("FIREBIRD_PRETTY") == "1" else 0
+
+def _flush_all(writes: List[tuple[str, bytes]]) -> None:
+    """Write all reports, then flush them to disk together before closing"""
+    fds = []
+    try:
+        for path, data in writes:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            fds.append(fd)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        sync = getattr(os, 'fdatasync', os.fsync)  # fdatasync isn't available on macOS
+        for fd in fds:
+            sync(fd)
+    finally:
+        for fd in fds:
+            os.close(fd)
+
+def _cache_path(topic: str, search_depth: str, time_range: str | None = None) -> str:
+    """Cache file for a Tavily search, keyed on the normalized topic and search options"""
+    key = '|'.join((' '.join(topic.lower().split()), search_depth, time_range or ''))
+    return f"{CACHE_DIR}/{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}.json"
+
 class AutonomousResearcher:
-    def __init__(self, worker_id: int, topic: str):
+    def __init__(self, worker_id: int, topic: str, session: aiohttp.ClientSession):
         self.worker_id = worker_id
         self.topic = topic
-        self.start_time = datetime.now()
+        self.session = session
+        self._t0 = time.perf_counter()
         self.results = {}
         
     async def research(self):
@@ -50,14 +101,11 @@ class AutonomousResearcher:
         # Analyze findings
         analysis = await self.analyze(search_results)
         
-        # Generate report
+        # Generate report (saved by the swarm's batched flush)
         report = await self.generate_report(analysis)
         
-        # Save results
-        await self.save_results(report)
-        
-        duration = (datetime.now() - self.start_time).total_seconds()
-        print(f"[Worker {self.worker_id}] ✅ Completed in {duration:.1f}s: {self.topic[:50]}...")
+        duration = time.perf_counter() - self._t0
+        print(f"[Worker {self.worker_id}] 🔎 Research done in {duration:.1f}s: {self.topic[:50]}...")
         
         return report
     
@@ -65,18 +113,28 @@ class AutonomousResearcher:
         """Parallel web search using multiple APIs"""
         print(f"[Worker {self.worker_id}] 🌐 Searching web...")
         
-        # Tavily search (proven working)
-        tavily_client = TavilyClient()
-        results = await asyncio.to_thread(
-            tavily_client.search,
-            query=self.topic,
-            search_depth="advanced",
-            include_answer=True,
-            include_raw_content=True,
-            max_results=10,
-        )
+        # Reuse a recent response for the same (normalized) topic if we have one
+        cache_path = _cache_path(self.topic, search_depth="advanced")
+        results = await asyncio.to_thread(read_cache, cache_path)
+        if results is None:
+            # Tavily search over the swarm's shared connection pool
+            async with TAVILY_SEM, self.session.post(
+                TAVILY_SEARCH_URL,
+                json={
+                    "query": self.topic,
+                    "search_depth": "advanced",
+                    "include_answer": True,
+                    "include_raw_content": True,
+                    "max_results": 10,
+                },
+            ) as response:
+                response.raise_for_status()
+                raw = await response.read()
+            results = orjson.loads(raw)
+            await asyncio.to_thread(write_cache, cache_path, raw)
         
-        # Store results
+        # Store results, keeping only the first hit for each URL
+        seen = set()
         self.results['sources'] = [
             {
                 'title': r['title'],
@@ -85,6 +143,7 @@ class AutonomousResearcher:
                 'query': self.topic
             }
             for r in results.get('results', [])
+            if r['url'] not in seen and not seen.add(r['url'])
         ]
         
         print(f"[Worker {self.worker_id}] 📚 Found {len(self.results['sources'])} sources")
@@ -94,30 +153,19 @@ class AutonomousResearcher:
         """Analyze sources and identify patterns"""
         print(f"[Worker {self.worker_id}] 🧠 Analyzing sources...")
         
-        # Simple keyword extraction
-        all_content = ' '.join([s['content'] for s in sources[:5]])
-        
-        # Extract key concepts
-        key_concepts = [
-            "Temporal workflows",
-            "Durable execution",
-            "Agent orchestration",
-            "Crash recovery",
-            "Multi-agent systems",
-            "AI agents",
-            "Event sourcing",
-            "State management",
-            "Persistence",
-            "Coordination"
-        ]
-        
-        found_concepts = [c for c in key_concepts if c.lower() in all_content.lower()]
+        # Extract key concepts source by source, stopping once every concept is seen
+        hits = set()
+        for s in sources[:5]:
+            hits.update(m.lower() for m in _CONCEPT_RE.findall(s['content']))
+            if len(hits) == len(KEY_CONCEPTS):
+                break
+        found_concepts = [c for c, lc in _KEY_CONCEPTS_LC if lc in hits]
         
         self.results['key_concepts'] = found_concepts
         self.results['analysis'] = {
             'total_sources': len(sources),
             'key_concepts_found': len(found_concepts),
-            'coverage': len(found_concepts) / len(key_concepts)
+            'coverage': len(found_concepts) / len(KEY_CONCEPTS)
         }
         
         return self.results['analysis']
@@ -129,8 +177,8 @@ class AutonomousResearcher:
         report = {
             'worker_id': self.worker_id,
             'topic': self.topic,
-            'timestamp': datetime.now().isoformat(),
-            'duration_seconds': (datetime.now() - self.start_time).total_seconds(),
+            'timestamp': datetime.now(),
+            'duration_seconds': time.perf_counter() - self._t0,
             'executive_summary': f"Research on '{self.topic}' completed. Found {analysis['total_sources']} sources with {analysis['key_concepts_found']} key concepts identified. Coverage: {analysis['coverage']:.1%}",
             'key_findings': [
                 f"Identified {len(self.results['sources'])} relevant sources",
@@ -149,16 +197,13 @@ class AutonomousResearcher:
         
         return report
     
-    async def save_results(self, report: Dict):
-        """Save to reports directory"""
+    def save_results(self, report: Dict) -> tuple[str, bytes]:
+        """Serialize the report and return its (path, data) for the swarm to write"""
         filename = f"reports/research_worker_{self.worker_id:02d}_{self.topic.replace(' ', '_')[:30]}.json"
         filepath = f"/adapt/projects/firebird/{filename}"
         
-        with open(filepath, 'w') as f:
-            json.dump(report, f, indent=2)
-        
-        print(f"[Worker {self.worker_id}] 💾 Saved: {filename}")
         self.results['saved_file'] = filepath
+        return filepath, orjson.dumps(report, option=_JSON_OPTIONS)
 
 async def run_research_swarm():
     """Run 20 parallel research workers"""
@@ -168,9 +213,15 @@ async def run_research_swarm():
     print("=" * 80)
     print()
     
+    # One pooled session so all workers reuse the same TCP/TLS connections
+    session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300),
+        headers={"Authorization": f"Bearer {os.environ['TAVILY_API_KEY']}"},
+    )
+    
     # Create 20 researchers
     researchers = [
-        AutonomousResearcher(i, topic)
+        AutonomousResearcher(i, topic, session)
         for i, topic in enumerate(RESEARCH_TOPICS, 1)
     ]
     
@@ -178,12 +229,28 @@ async def run_research_swarm():
     print(f"📡 Launching {len(researchers)} parallel research workers...")
     print()
     
-    start_time = datetime.now()
+    started_at = datetime.now()
+    start_time = time.perf_counter()
     
-    # Run all research in parallel
-    results = await asyncio.gather(*[r.research() for r in researchers])
+    # Run all research in parallel; a failed worker doesn't cost the others their reports
+    try:
+        outcomes = await asyncio.gather(*[r.research() for r in researchers], return_exceptions=True)
+    finally:
+        await session.close()
     
-    duration = (datetime.now() - start_time).total_seconds()
+    succeeded = []
+    for r, outcome in zip(researchers, outcomes):
+        if isinstance(outcome, BaseException):
+            print(f"[Worker {r.worker_id}] ❌ Failed: {outcome!r}")
+        else:
+            succeeded.append((r, outcome))
+    results = [report for _, report in succeeded]
+    
+    # Write every report in one batch, syncing them together at the end
+    await asyncio.to_thread(_flush_all, [r.save_results(report) for r, report in succeeded])
+    print(f"💾 Saved {len(results)} worker reports")
+    
+    duration = time.perf_counter() - start_time
     
     print()
     print("=" * 80)
@@ -195,35 +262,39 @@ async def run_research_swarm():
     print()
     
     # Generate summary report
-    await generate_summary_report(results)
+    await generate_summary_report(results, started_at)
     
     print()
     print("🎉 All reports saved to /adapt/projects/firebird/reports/")
     print("📈 Check the Temporal UI: http://localhost:8080")
     print("=" * 80)
 
-async def generate_summary_report(results: List[Dict]):
+async def generate_summary_report(results: List[Dict], started_at: datetime):
     """Generate executive summary of all research"""
     print("📋 Generating executive summary...")
     
     all_concepts = []
-    all_sources = []
+    all_sources = {}  # keyed by URL so sources shared between workers count once
     
     for r in results:
         if 'key_concepts' in r:
             all_concepts.extend(r['key_concepts'])
         if 'sources' in r:
-            all_sources.extend(r['sources'])
+            for s in r['sources']:
+                all_sources.setdefault(s['url'], s)
+    
+    concept_frequency = Counter(all_concepts)
     
+    now = datetime.now()
     summary = {
         'research_title': 'Autonomous AI Multi-Agent Systems with Temporal',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': now,
         'total_workers': len(results),
-        'duration_minutes': (datetime.now() - min([datetime.fromisoformat(r['timestamp']) for r in results])).total_seconds() / 60,
+        'duration_minutes': (now - started_at).total_seconds() / 60,
         'consolidated_findings': {
             'total_sources': len(all_sources),
-            'unique_concepts': list(set(all_concepts)),
-            'concept_frequency': {c: all_concepts.count(c) for c in set(all_concepts)}
+            'unique_concepts': sorted(concept_frequency),
+            'concept_frequency': concept_frequency,  # orjson serializes the Counter as a dict
         },
         'recommendations': [
             "Temporal provides robust durable execution for AI agents",
@@ -241,10 +312,10 @@ async def generate_summary_report(results: List[Dict]):
         ]
     }
     
-    with open('/adapt/projects/firebird/reports/executive_summary.json', 'w') as f:
-        json.dump(summary, f, indent=2)
+    data = orjson.dumps(summary, option=_JSON_OPTIONS)
+    await asyncio.to_thread(write_bytes, f"{REPORTS_DIR}/executive_summary.json", data)
     
     print("✅ Executive summary saved: reports/executive_summary.json")
 
 if __name__ == "__main__":
-    asyncio.run(run_research_swarm())
+    run(run_research_swarm())
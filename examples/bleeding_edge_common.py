@@ -0,0 +1,92 @@
+"""Helpers shared by the BLEEDING EDGE research modules"""
+
+import asyncio
+import functools
+import os
+import tempfile
+import time
+from typing import Any, Coroutine, Dict, List, Optional, TypeVar
+
+import orjson
+
+T = TypeVar("T")
+
+# Publication months (YYYY-MM) kept by the June-November 2025 filter
+ALLOWED_MONTHS = frozenset(f"2025-{m:02d}" for m in range(6, 12))
+
+# Characters replaced with '_' when turning a topic into a report filename
+SAFE_FILENAME_TR = str.maketrans({' ': '_', '/': '_', ':': '_'})
+
+# Cap in-flight Tavily requests per worker so parallel workflows don't trip the rate limit
+TAVILY_SEM = asyncio.Semaphore(int(os.environ.get("TAVILY_CONCURRENCY", "8")))
+
+# Seconds a cached Tavily response stays valid
+TAVILY_CACHE_TTL_SECONDS = int(os.environ.get("TAVILY_CACHE_TTL", str(6 * 60 * 60)))
+
+
+@functools.lru_cache(maxsize=1)
+def shared_tavily_client():
+    """Shared Tavily client, so every activity reuses one HTTP session"""
+    # Imported on first use rather than at module level, keeping it out of the workflow sandbox
+    from tavily import TavilyClient
+
+    return TavilyClient()
+
+
+def write_bytes(path: str, data: bytes) -> None:
+    """Write a report to disk (called via asyncio.to_thread to keep I/O off the loop)"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def read_cache(path: str) -> Optional[Dict[str, Any]]:
+    """Return a cached Tavily response, or None if it is missing, corrupt or older than the TTL"""
+    try:
+        if time.time() - os.stat(path).st_mtime > TAVILY_CACHE_TTL_SECONDS:
+            return None
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return None
+
+
+def write_cache(path: str, data: bytes) -> None:
+    """Store a Tavily response atomically, so a crash mid-write can't leave a truncated entry"""
+    cache_dir = os.path.dirname(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def tavily_sources(results: Dict[str, Any], topic: str) -> List[Dict[str, Any]]:
+    """Tavily's result dicts, annotated in place with content, published_date and query
+
+    Raw page content isn't used downstream, so it's dropped to keep activity results small.
+    """
+    sources = results.get('results', [])
+    for r in sources:
+        r.pop('raw_content', None)
+        r.setdefault('content', r.get('snippet', ''))
+        r.setdefault('published_date', 'N/A')
+        r['query'] = topic
+    return sources
+
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """Run an entrypoint coroutine on uvloop when it's installed (the optional `uvloop` extra)"""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+    return uvloop.run(main)
@@ -3,12 +3,22 @@
 import asyncio
 import json
 import os
+import time
 from datetime import datetime
 from typing import List, Dict, Any
 import temporalio
 from temporalio import workflow, activity
 from temporalio.client import Client
 from datetime import timedelta
+from bleeding_edge_common import (
+    ALLOWED_MONTHS,
+    SAFE_FILENAME_TR,
+    TAVILY_SEM,
+    run,
+    shared_tavily_client,
+    tavily_sources,
+    write_bytes,
+)
 
 RESEARCH_TOPICS = [
     "Temporal workflow patterns for AI agents 2025",
@@ -33,36 +43,23 @@ RESEARCH_TOPICS = [
     "Autonomous AI systems Temporal case studies 2025"
 ]
 
+
 @activity.defn
 async def bleeding_edge_research_activity(topic: str) -> Dict[str, Any]:
-    from tavily import TavilyClient
     print(f"[Activity] Research: {topic}")
-    tavily_client = TavilyClient()
-    results = await asyncio.to_thread(
-        tavily_client.search,
-        query=topic,
-        search_depth="advanced",
-        include_answer=True,
-        include_raw_content=True,
-        max_results=15,
-        time_range="month"
-    )
-    sources = [
-        {
-            'title': r['title'],
-            'url': r['url'],
-            'content': r.get('content', r.get('snippet', '')),
-            'query': topic,
-            'published_date': r.get('published_date', 'N/A')
-        }
-        for r in results.get('results', [])
-    ]
-    filtered_sources = []
-    for source in sources:
-        date_str = source.get('published_date', '')
-        if '2025-06' in date_str or '2025-07' in date_str or '2025-08' in date_str or \
-           '2025-09' in date_str or '2025-10' in date_str or '2025-11' in date_str:
-            filtered_sources.append(source)
+    tavily_client = shared_tavily_client()
+    async with TAVILY_SEM:
+        results = await asyncio.to_thread(
+            tavily_client.search,
+            query=topic,
+            search_depth="advanced",
+            include_answer=True,
+            include_raw_content=True,
+            max_results=15,
+            time_range="month"
+        )
+    sources = tavily_sources(results, topic)
+    filtered_sources = [s for s in sources if s.get('published_date', '')[:7] in ALLOWED_MONTHS]
     if not filtered_sources:
         filtered_sources = sources[:10]
     return {
@@ -77,7 +74,7 @@ async def generate_markdown_report_activity(research_data: Dict[str, Any]) -> st
     topic = research_data['topic']
     print(f"[Activity] Report: {topic[:50]}")
     sources_count = len(research_data['sources'])
-    md_content = f"""# {topic}
+    parts = [f"""# {topic}
 
 **Generated**: {research_data['timestamp']}
 **Period**: {research_data['date_filter']}
@@ -91,14 +88,16 @@ Research completed on '{topic}' with {sources_count} sources from June-November
 
 ## Sources
 
-"""
-    for i, source in enumerate(research_data['sources'][:5], 1):
-        md_content += f"### {i}. {source['title']}\n\n{source['content'][:500]}...\n\n"
-    safe_filename = topic.replace(' ', '_').replace('/', '_').replace(':', '_')[:50]
+"""]
+    parts.extend(
+        f"### {i}. {source['title']}\n\n{source['content'][:500]}...\n\n"
+        for i, source in enumerate(research_data['sources'][:5], 1)
+    )
+    md_content = "".join(parts)
+    safe_filename = topic.translate(SAFE_FILENAME_TR)[:50]
     md_path = f"/adapt/projects/firebird/reports/{safe_filename}.md"
     os.makedirs(os.path.dirname(md_path), exist_ok=True)
-    with open(md_path, 'w') as f:
-        f.write(md_content)
+    await asyncio.to_thread(write_bytes, md_path, md_content.encode())
     return md_path
 
 @workflow.defn
@@ -111,10 +110,10 @@ class BleedingEdgeResearchWorkflow:
             topic,
             start_to_close_timeout=timedelta(minutes=3),
         )
-        report_path = await workflow.execute_activity(
+        report_path = await workflow.execute_local_activity(
             generate_markdown_report_activity,
             research_data,
-            start_to_close_timeout=timedelta(minutes=1),
+            start_to_close_timeout=timedelta(seconds=30),
         )
         return report_path
 
@@ -123,20 +122,20 @@ class BleedingEdgeOrchestrator:
     @workflow.run
     async def run_all(self, topics: List[str]) -> List[str]:
         print(f"[Orchestrator] {len(topics)} workflows...")
-        async with workflow.TaskGroup() as tg:
-            tasks = [
-                tg.create_task(
-                    workflow.execute_child_workflow(
-                        "BleedingEdgeResearchWorkflow",
-                        topic,
-                        id=f"bleeding-{i}",
-                        task_queue="research-tasks",
-                        
-                    )
+        outcomes = await asyncio.gather(
+            *[
+                workflow.execute_child_workflow(
+                    "BleedingEdgeResearchWorkflow",
+                    topic,
+                    id=f"bleeding-{i}",
+                    task_queue="research-tasks",
+                    execution_timeout=timedelta(minutes=5),
                 )
                 for i, topic in enumerate(topics, 1)
-            ]
-        return [task.result() for task in tasks]
+            ],
+            return_exceptions=True,
+        )
+        return [r for r in outcomes if not isinstance(r, BaseException)]
 
 async def run_bleeding_edge_swarm():
     print("=" * 80)
@@ -147,7 +146,7 @@ async def run_bleeding_edge_swarm():
     client = await Client.connect("localhost:7233")
     print("✅ Connected to Temporal")
     print()
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     handle = await client.start_workflow(
         "BleedingEdgeOrchestrator.run_all",
         RESEARCH_TOPICS,
@@ -157,7 +156,7 @@ async def run_bleeding_edge_swarm():
     )
     print("⏳ Running 20 workflows...")
     results = await handle.result()
-    duration = (datetime.now() - start_time).total_seconds()
+    duration = time.perf_counter() - start_time
     print()
     print("=" * 80)
     print("✅ BLEEDING EDGE COMPLETE!")
@@ -169,4 +168,4 @@ async def run_bleeding_edge_swarm():
     print("=" * 80)
 
 if __name__ == "__main__":
-    asyncio.run(run_bleeding_edge_swarm())
+    run(run_bleeding_edge_swarm())
@@ -3,12 +3,23 @@
 import asyncio
 import json
 import os
+import time
 from datetime import datetime
 from typing import List, Dict, Any
 import temporalio
 from temporalio import workflow, activity
 from temporalio.client import Client
+from temporalio.contrib.pydantic import pydantic_data_converter
 from datetime import timedelta
+from bleeding_edge_common import (
+    ALLOWED_MONTHS,
+    SAFE_FILENAME_TR,
+    TAVILY_SEM,
+    run,
+    shared_tavily_client,
+    tavily_sources,
+    write_bytes,
+)
 
 
 # Research topics (20 topics)
@@ -40,40 +51,24 @@ RESEARCH_TOPICS = [
 @activity.defn
 async def bleeding_edge_research_activity(topic: str) -> Dict[str, Any]:
     """BLEEDING EDGE research - June-Nov 2025 only"""
-    # Import inside activity (not at module level)
-    from tavily import TavilyClient
-    
     print(f"[Activity] 🔥 Research: {topic}")
 
-    tavily_client = TavilyClient()
-    results = await asyncio.to_thread(
-        tavily_client.search,
-        query=topic,
-        search_depth="advanced",
-        include_answer=True,
-        include_raw_content=True,
-        max_results=15,
-        time_range="month"  # Last month
-    )
+    tavily_client = shared_tavily_client()
+    async with TAVILY_SEM:
+        results = await asyncio.to_thread(
+            tavily_client.search,
+            query=topic,
+            search_depth="advanced",
+            include_answer=True,
+            include_raw_content=True,
+            max_results=15,
+            time_range="month"  # Last month
+        )
 
-    sources = [
-        {
-            'title': r['title'],
-            'url': r['url'],
-            'content': r.get('content', r.get('snippet', '')),
-            'query': topic,
-            'published_date': r.get('published_date', 'N/A')
-        }
-        for r in results.get('results', [])
-    ]
+    sources = tavily_sources(results, topic)
 
     # Filter for June-Nov 2025
-    filtered_sources = []
-    for source in sources:
-        date_str = source.get('published_date', '')
-        if '2025-06' in date_str or '2025-07' in date_str or '2025-08' in date_str or \
-           '2025-09' in date_str or '2025-10' in date_str or '2025-11' in date_str:
-            filtered_sources.append(source)
+    filtered_sources = [s for s in sources if s.get('published_date', '')[:7] in ALLOWED_MONTHS]
 
     if not filtered_sources:
         filtered_sources = sources[:10]
@@ -93,7 +88,7 @@ async def generate_markdown_report_activity(research_data: Dict[str, Any]) -> st
     print(f"[Activity] 📝 Report: {topic[:50]}...")
 
     sources_count = len(research_data['sources'])
-    md_content = f"""# 🔥 {topic}
+    parts = [f"""# 🔥 {topic}
 
 **Generated**: {research_data['timestamp']}
 **Period**: {research_data['date_filter']}
@@ -107,17 +102,18 @@ Research completed on '{topic}' with {sources_count} sources from June-November
 
 ## Sources
 
-"""
-    
-    for i, source in enumerate(research_data['sources'][:5], 1):
-        md_content += f"### {i}. {source['title']}\n\n{source['content'][:500]}...\n\n"
+"""]
+    parts.extend(
+        f"### {i}. {source['title']}\n\n{source['content'][:500]}...\n\n"
+        for i, source in enumerate(research_data['sources'][:5], 1)
+    )
+    md_content = "".join(parts)
 
-    safe_filename = topic.replace(' ', '_').replace('/', '_').replace(':', '_')[:50]
+    safe_filename = topic.translate(SAFE_FILENAME_TR)[:50]
     md_path = f"/adapt/projects/firebird/reports/{safe_filename}.md"
     
     os.makedirs(os.path.dirname(md_path), exist_ok=True)
-    with open(md_path, 'w') as f:
-        f.write(md_content)
+    await asyncio.to_thread(write_bytes, md_path, md_content.encode())
 
     return md_path
 
@@ -133,10 +129,10 @@ class BleedingEdgeResearchWorkflow:
             topic,
             start_to_close_timeout=timedelta(minutes=3),
         )
-        report_path = await workflow.execute_activity(
+        report_path = await workflow.execute_local_activity(
             generate_markdown_report_activity,
             research_data,
-            start_to_close_timeout=timedelta(minutes=1),
+            start_to_close_timeout=timedelta(seconds=30),
         )
         return report_path
 
@@ -146,20 +142,20 @@ class BleedingEdgeOrchestrator:
     @workflow.run
     async def run_all(self, topics: List[str]) -> List[str]:
         print(f"[Orchestrator] 🔥 {len(topics)} workflows...")
-        async with workflow.TaskGroup() as tg:
-            tasks = [
-                tg.create_task(
-                    workflow.execute_child_workflow(
-                        "BleedingEdgeResearchWorkflow",
-                        topic,
-                        id=f"bleeding-{i}",
-                        task_queue="research-tasks",
-                        start_to_close_timeout=timedelta(minutes=5),
-                    )
+        outcomes = await asyncio.gather(
+            *[
+                workflow.execute_child_workflow(
+                    "BleedingEdgeResearchWorkflow",
+                    topic,
+                    id=f"bleeding-{i}",
+                    task_queue="research-tasks",
+                    execution_timeout=timedelta(minutes=5),
                 )
                 for i, topic in enumerate(topics, 1)
-            ]
-        return [task.result() for task in tasks]
+            ],
+            return_exceptions=True,
+        )
+        return [r for r in outcomes if not isinstance(r, BaseException)]
 
 
 async def generate_executive_markdown():
@@ -196,8 +192,7 @@ async def generate_executive_markdown():
 """
     
     exec_path = "/adapt/projects/firebird/reports/EXECUTIVE_SUMMARY.md"
-    with open(exec_path, 'w') as f:
-        f.write(exec_md)
+    await asyncio.to_thread(write_bytes, exec_path, exec_md.encode())
     
     return exec_path
 
@@ -210,23 +205,23 @@ async def run_bleeding_edge_swarm():
     print("=" * 80)
     print()
 
-    client = await Client.connect("localhost:7233")
+    client = await Client.connect("localhost:7233", data_converter=pydantic_data_converter)
     print("✅ Connected to Temporal")
     print()
 
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     
     handle = await client.start_workflow(
         "BleedingEdgeOrchestrator.run_all",
         RESEARCH_TOPICS,
         id="bleeding-orchestrator",
         task_queue="research-tasks",
-        start_to_close_timeout=timedelta(minutes=15),
+        execution_timeout=timedelta(minutes=15),
     )
 
     print("⏳ Running 20 workflows...")
     results = await handle.result()
-    duration = (datetime.now() - start_time).total_seconds()
+    duration = time.perf_counter() - start_time
 
     exec_path = await generate_executive_markdown()
 
@@ -243,4 +238,4 @@ async def run_bleeding_edge_swarm():
 
 
 if __name__ == "__main__":
-    asyncio.run(run_bleeding_edge_swarm())
+    run(run_bleeding_edge_swarm())
@@ -1,12 +1,16 @@
 """Temporal Worker for Bleeding Edge Research"""
 
 import asyncio
+import os
 import temporalio
+from temporalio.contrib.pydantic import pydantic_data_converter
 from temporalio.worker import Worker
 from temporal_research_workflows_v2 import (
     BleedingEdgeResearchWorkflow,
     BleedingEdgeOrchestrator,
+    batch_research_activity,
     bleeding_edge_research_activity,
+    close_tavily_session,
     generate_markdown_report_activity,
 )
 
@@ -23,6 +27,7 @@ async def main():
     print()
     print("Registering activities:")
     print("  - bleeding_edge_research_activity (June-Nov 2025)")
+    print("  - batch_research_activity (June-Nov 2025)")
     print("  - generate_markdown_report_activity (Markdown)")
     print()
     print("📅 Date Filter: June-November 2025 ONLY")
@@ -31,10 +36,19 @@ async def main():
 
     # Create worker
     worker = Worker(
-        client=await temporalio.client.Client.connect("localhost:7233"),
+        client=await temporalio.client.Client.connect(
+            "localhost:7233", data_converter=pydantic_data_converter
+        ),
         task_queue="research-tasks",
         workflows=[BleedingEdgeResearchWorkflow, BleedingEdgeOrchestrator],
-        activities=[bleeding_edge_research_activity, generate_markdown_report_activity],
+        activities=[
+            bleeding_edge_research_activity,
+            batch_research_activity,
+            generate_markdown_report_activity,
+        ],
+        # Activities default to the workflow's own task queue, so Temporal can hand them
+        # eagerly to this worker; same default as the other research-tasks workers
+        max_concurrent_activities=int(os.environ.get("TEMPORAL_MAX_CONCURRENT_ACTIVITIES", "32")),
     )
 
     print("✅ Worker ready!")
@@ -44,7 +58,10 @@ async def main():
     print()
 
     # Run worker
-    await worker.run()
+    try:
+        await worker.run()
+    finally:
+        await close_tavily_session()
 
 
 if __name__ == "__main__":
@@ -9,17 +9,27 @@ The agent survives crashes thanks to Temporal's durable execution.
 """
 
 import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List
+from datetime import timedelta
+from functools import cache
+from typing import Any, Awaitable, List, Literal, TypeVar
 
+import httpx
 import logfire
+import orjson
 from pydantic import BaseModel, Field
-from tavily import TavilyClient
 
 # Import Pydantic AI with Temporal support
 try:
     from pydantic_ai import Agent, RunContext
-    from pydantic_ai.durable_exec.temporal import TemporalAgent
+    from pydantic_ai.durable_exec.temporal import PydanticAIPlugin, TemporalAgent
+    from pydantic_ai.models.groq import GroqModel
+    from pydantic_ai.providers.groq import GroqProvider
+    from pydantic_ai.settings import ModelSettings
 except ImportError as e:
     print(f"Error importing pydantic_ai with temporal support: {e}")
     print("Make sure pydantic-ai-slim[temporal] is installed")
@@ -29,6 +39,8 @@ except ImportError as e:
 import temporalio
 from temporalio import workflow, activity
 from temporalio.client import Client
+from temporalio.common import RetryPolicy
+from temporalio.exceptions import ActivityError
 
 
 # Configure logfire for observability
@@ -40,6 +52,161 @@ except Exception:
     pass
 
 
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+
+def _shared_http_client() -> httpx.AsyncClient:
+    """Pooled HTTP/2 client shared by every Tavily and Groq call in this module."""
+    client = _cached_shared_http_client()
+    if client.is_closed:
+        # Recreate the client if it was closed, e.g. at the end of a previous run,
+        # along with the cached agents whose models still hold the old one.
+        _cached_shared_http_client.cache_clear()
+        _analysis_agent.cache_clear()
+        client = _cached_shared_http_client()
+    return client
+
+
+@cache
+def _cached_shared_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=128, max_keepalive_connections=64),
+        timeout=httpx.Timeout(60, connect=5),
+    )
+
+
+ModelTier = Literal["instant", "fast70b", "balanced", "cached"]
+
+# Groq models by speed tier: planning is short and uses `instant`, while the long
+# structured analysis uses the speculative-decoding 70B model for faster output.
+# `cached` is a model with prompt caching, for repeated runs that share a prefix.
+SPEED_MAP: dict[ModelTier, str] = {
+    "instant": "llama-3.1-8b-instant",
+    "fast70b": "llama-3.3-70b-specdec",
+    "balanced": "llama-3.3-70b-versatile",
+    "cached": "moonshotai/kimi-k2-instruct-0905",
+}
+
+
+def _groq_model(tier: ModelTier) -> GroqModel:
+    """Groq model for `tier` that sends its requests over the shared HTTP client."""
+    return GroqModel(SPEED_MAP[tier], provider=GroqProvider(http_client=_shared_http_client()))
+
+
+# Recent Tavily searches keyed on (normalized query, options), least recently used
+# first, with the monotonic time each search started; entries expire after the TTL
+SEARCH_CACHE_SIZE = 512
+SEARCH_CACHE_TTL_SECONDS = 6 * 60 * 60
+_search_cache: OrderedDict[
+    tuple[str, tuple[tuple[str, Any], ...]], tuple[float, asyncio.Future[dict[str, Any]]]
+] = OrderedDict()
+
+
+async def _tavily_search(query: str, **options: Any) -> dict[str, Any]:
+    """Search Tavily, reusing the response for a query that was already searched.
+
+    Concurrent searches for the same query share a single in-flight request.
+    """
+    key = (" ".join(query.lower().split()), tuple(sorted(options.items())))
+    now = time.monotonic()
+    entry = _search_cache.get(key)
+    if entry is None or now - entry[0] > SEARCH_CACHE_TTL_SECONDS:
+        entry = (now, asyncio.ensure_future(_fetch_tavily(query, **options)))
+        _search_cache[key] = entry
+        _search_cache.move_to_end(key)
+        if len(_search_cache) > SEARCH_CACHE_SIZE:
+            _search_cache.popitem(last=False)
+    else:
+        _search_cache.move_to_end(key)
+    try:
+        # Shield so one cancelled caller doesn't cancel the request for the others.
+        return await asyncio.shield(entry[1])
+    except Exception:
+        if _search_cache.get(key) is entry:
+            del _search_cache[key]
+        raise
+
+
+# Seconds a batch of searches may take; slower queries are cancelled and the
+# research goes ahead with whatever came back in time
+SEARCH_BATCH_DEADLINE = 8.0
+
+T = TypeVar("T")
+
+
+async def _completed_within(searches: dict[str, Awaitable[T]], timeout: float) -> list[T]:
+    """Await `searches` (keyed by query) concurrently, returning the successful results in order.
+
+    Searches that fail, or are still running after `timeout` seconds (these are
+    cancelled), are logged and left out.
+    """
+    tasks = {asyncio.ensure_future(search): query for query, search in searches.items()}
+    if not tasks:
+        return []
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+        logfire.warn("Search timed out", query=tasks[task], timeout=timeout)
+    results = []
+    for task, query in tasks.items():
+        if task not in done:
+            continue
+        error = asyncio.CancelledError() if task.cancelled() else task.exception()
+        if error is None:
+            results.append(task.result())
+        else:
+            logfire.warn("Search failed", query=query, error=repr(error))
+    return results
+
+
+async def _fetch_tavily(query: str, **options: Any) -> dict[str, Any]:
+    """Search Tavily's REST API directly on the event loop (no thread hop)."""
+    response = await _shared_http_client().post(
+        TAVILY_SEARCH_URL,
+        json={"query": query, **options},
+        headers={"Authorization": f"Bearer {os.environ['TAVILY_API_KEY']}"},
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+# Input tokens the analysis prompt may spend on search result content; TTFT on
+# Groq grows with prompt length, so this caps it regardless of result count.
+# Sized so it binds for a typical plan's 10-30 results.
+CONTEXT_TOKEN_BUDGET = 4000
+CHARS_PER_TOKEN = 4
+# Most characters any single result contributes, however few results there are
+MAX_RESULT_CHARS = 1000
+
+# Separators used when laying out the analysis prompt
+_EQ80 = "=" * 80
+_DASH80 = "-" * 80
+
+# System prompts never mention the topic (it goes in the user message), so every
+# run shares the same prefix and can hit the provider's prompt cache; temperature 0
+# keeps repeated requests deterministic for the same reason.
+DETERMINISTIC_SETTINGS = ModelSettings(temperature=0)
+
+PLANNING_SYSTEM_PROMPT = """You are a research planning expert. Generate 3-5 strategic search queries
+that will comprehensively cover the topic. Each query should focus on a different aspect.
+"""
+
+SEARCH_SYSTEM_PROMPT = "You are a search expert. Use the tavily_search tool to find relevant information."
+
+ANALYSIS_SYSTEM_PROMPT = """You are an expert research analyst. Analyze the provided search results and create a comprehensive research report.
+
+Your analysis should:
+1. Identify key findings and insights
+2. Synthesize information across multiple sources
+3. Provide a clear executive summary
+4. List all sources used
+5. Give a detailed analysis
+
+Be objective, thorough, and cite sources where appropriate.
+"""
+
+
 # Define data models
 class SearchQuery(BaseModel):
     """A single search query."""
@@ -47,8 +214,13 @@ class SearchQuery(BaseModel):
     focus_area: str = Field(description="Specific aspect to focus on")
 
 
-class SearchResult(BaseModel):
-    """A search result from Tavily."""
+@dataclass(frozen=True, slots=True)
+class SearchResult:
+    """A search result from Tavily.
+
+    A plain dataclass rather than a model: it is only built from Tavily responses
+    and passed between activities, so there's nothing to validate on construction.
+    """
     title: str
     url: str
     content: str
@@ -72,15 +244,51 @@ class DeepResearchReport(BaseModel):
     detailed_analysis: str = Field(description="Comprehensive analysis")
 
 
+@cache
+def _analysis_agent(tier: ModelTier) -> Agent[None, DeepResearchReport]:
+    """Analysis agent for `tier`, built once so its output schema is only compiled once."""
+    return Agent(
+        _groq_model(tier),
+        output_type=DeepResearchReport,
+        system_prompt=ANALYSIS_SYSTEM_PROMPT,
+        model_settings=DETERMINISTIC_SETTINGS,
+    )
+
+
+# Planner for DeepResearchWorkflow. Defined at module level so the worker can
+# register its model-request activity (AgentPlugin) before the workflow runs it.
+planning_agent = TemporalAgent(
+    Agent(
+        _groq_model("instant"),
+        name="planning_agent",
+        output_type=ResearchPlan,
+        system_prompt=PLANNING_SYSTEM_PROMPT,
+        model_settings=DETERMINISTIC_SETTINGS,
+    )
+)
+
+
 # Activities for Temporal
 @activity.defn
 async def search_activity(query: str) -> List[SearchResult]:
     """Perform a single search using Tavily."""
-    import asyncio
-    client = TavilyClient()
-    results = await asyncio.to_thread(
-        client.search,
-        query=query,
+    return await _search(query)
+
+
+@activity.defn
+async def search_batch_activity(queries: List[str]) -> List[List[SearchResult]]:
+    """Perform several Tavily searches concurrently in one activity.
+
+    One activity per plan saves a Temporal task-queue round trip per query.
+    Failed searches, and ones not done within `SEARCH_BATCH_DEADLINE`, are
+    dropped from the result.
+    """
+    return await _completed_within({q: _search(q) for q in dict.fromkeys(queries)}, SEARCH_BATCH_DEADLINE)
+
+
+async def _search(query: str) -> List[SearchResult]:
+    results = await _tavily_search(
+        query,
         search_depth="advanced",
         include_answer=True,
         include_raw_content=True,
@@ -91,7 +299,7 @@ async def search_activity(query: str) -> List[SearchResult]:
         SearchResult(
             title=result["title"],
             url=result["url"],
-            content=result.get("content", result.get("snippet", "")),
+            content=result.get("content") or result.get("snippet", ""),
             query=query,
         )
         for result in results["results"]
@@ -100,47 +308,58 @@ async def search_activity(query: str) -> List[SearchResult]:
 
 @activity.defn
 async def analysis_activity(
-    topic: str, all_results: List[List[SearchResult]]
+    topic: str, all_results: List[List[SearchResult]], tier: ModelTier = "fast70b"
 ) -> DeepResearchReport:
-    """Analyze all search results and synthesize into a report."""
-    # Flatten results
-    flat_results = [item for sublist in all_results for item in sublist]
+    """Analyze all search results and synthesize into a report.
+
+    Pass `tier="instant"` to trade report quality for speed on small topics.
+    """
+    # Flatten results, skipping URLs already returned by another query
+    seen_urls: set[str] = set()
+    flat_results = [
+        item
+        for sublist in all_results
+        for item in sublist
+        if item.url not in seen_urls and not seen_urls.add(item.url)
+    ]
+
+    # Split the prompt's token budget (~4 chars per token) across results in
+    # linearly decreasing shares, so earlier (higher-ranked) results get more
+    # context; no result gets more than MAX_RESULT_CHARS
+    n = len(flat_results)
+    budget_chars = CONTEXT_TOKEN_BUDGET * CHARS_PER_TOKEN
+    weight_total = n * (n + 1) // 2 or 1
 
     # Prepare context for the analysis agent
-    context = f"""
+    parts = [
+        f"""
     Topic: {topic}
 
     Search Results:
-    {'='*80}
+    {_EQ80}
     """
+    ]
 
     for i, result in enumerate(flat_results, 1):
-        context += f"""
+        max_chars = min(MAX_RESULT_CHARS, budget_chars * (n - i + 1) // weight_total)
+        content = result.content[:max_chars] if result.content else 'No content'
+        parts.append(
+            f"""
     Result {i} (Query: {result.query})
     Title: {result.title}
     URL: {result.url}
-    Content: {result.content[:1000] if result.content else 'No content'}
-    {'-'*80}
+    Content: {content}
+    {_DASH80}
     """
+        )
+    context = "".join(parts)
 
     # Use a smart model for analysis (llama via Groq)
-    analysis_agent = Agent(
-        "groq:llama-3.3-70b-versatile",
-        output_type=DeepResearchReport,
-        system_prompt=f"""You are an expert research analyst. Analyze the provided search results and create a comprehensive research report.
-
-Your analysis should:
-1. Identify key findings and insights
-2. Synthesize information across multiple sources
-3. Provide a clear executive summary
-4. List all sources used
-5. Give a detailed analysis
+    analysis_agent = _analysis_agent(tier)
 
-Be objective, thorough, and cite sources where appropriate.
-""",
-    )
-
-    result = await analysis_agent.run(
+    # Stream the report so partial output is validated as it arrives, heartbeating
+    # so long generations don't trip the activity's heartbeat timeout
+    async with analysis_agent.run_stream(
         f"""
         Please analyze the following search results for the topic: {topic}
 
@@ -148,9 +367,10 @@ Be objective, thorough, and cite sources where appropriate.
 
         Create a comprehensive research report.
         """
-    )
-
-    return result.output
+    ) as stream:
+        async for _partial_report in stream.stream_output():
+            activity.heartbeat()
+        return await stream.get_output()
 
 
 # Temporal Workflow
@@ -161,35 +381,46 @@ class DeepResearchWorkflow:
     @workflow.run
     async def run(self, topic: str, research_plan: ResearchPlan) -> DeepResearchReport:
         """Execute the research workflow."""
-        # Step 1: Generate search queries (if not provided)
+        # Step 1: Generate search queries (if not provided), searching the raw
+        # topic in the meantime so planning latency isn't spent idle. The extra
+        # search is best-effort: one attempt, done within the batch deadline.
+        speculative = None
         if not research_plan.queries:
-            planning_agent = Agent(
-                "minimax-m3",
-                result_type=ResearchPlan,
-                system_prompt="""You are a research planning expert. Generate 3-5 strategic search queries
-                that will comprehensively cover the topic. Each query should focus on a different aspect.
-                """,
+            speculative = asyncio.ensure_future(
+                workflow.execute_activity(
+                    search_activity,
+                    topic,
+                    schedule_to_close_timeout=timedelta(seconds=SEARCH_BATCH_DEADLINE),
+                    retry_policy=RetryPolicy(maximum_attempts=1),
+                )
             )
             result = await planning_agent.run(
                 f"Create a research plan for: {topic}",
             )
-            research_plan = result.data
-
-        # Step 2: Execute searches in parallel using asyncio.TaskGroup
-        async with asyncio.TaskGroup() as tg:
-            search_tasks = []
-            for search_query in research_plan.queries:
-                task = tg.create_task(
-                    workflow.execute_activity(search_activity, search_query.query)
-                )
-                search_tasks.append(task)
-
-        # Collect all results
-        all_results = [task.result() for task in search_tasks]
+            research_plan = result.output
+
+        # Step 2: Execute all searches in parallel within a single activity
+        all_results = await workflow.execute_activity(
+            search_batch_activity,
+            [search_query.query for search_query in research_plan.queries],
+            # The batch gives up on slow queries itself, so this only has to
+            # cover the deadline plus scheduling overhead
+            start_to_close_timeout=timedelta(seconds=2 * SEARCH_BATCH_DEADLINE),
+        )
+        if speculative is not None:
+            try:
+                all_results = [await speculative, *all_results]
+            except ActivityError:
+                workflow.logger.warning("Speculative search for %r failed", topic)
 
         # Step 3: Analyze all results
         final_report = await workflow.execute_activity(
-            analysis_activity, topic, all_results
+            analysis_activity,
+            args=[topic, all_results],
+            start_to_close_timeout=timedelta(minutes=5),
+            # The activity heartbeats on every streamed partial, so a stalled
+            # generation is retried long before the overall timeout
+            heartbeat_timeout=timedelta(seconds=30),
         )
 
         return final_report
@@ -198,7 +429,6 @@ class DeepResearchWorkflow:
 # Pydantic AI Agents with Temporal support
 def create_search_agent() -> TemporalAgent:
     """Create a search agent using Tavily."""
-    tavily_client = TavilyClient()
 
     async def search_tool(ctx: RunContext, query: str) -> str:
         """Search for information using Tavily."""
@@ -206,37 +436,44 @@ def create_search_agent() -> TemporalAgent:
             logfire.info("Performing search", query=query)
         except Exception:
             pass  # Logfire not configured
-        import asyncio
-        results = await asyncio.to_thread(
-            tavily_client.search,
-            query=query,
+        results = await _tavily_search(
+            query,
             search_depth="advanced",
             include_answer=True,
             max_results=5,
         )
-        return str(results)
-
-    # Create agent with temporal support
-    agent = TemporalAgent(
-        "groq:llama-3.1-8b-instant",
-        output_type=str,
-        system_prompt="You are a search expert. Use the tavily_search tool to find relevant information.",
+        # Only hand the model what it needs, to keep tool-result tokens down
+        compact = [
+            {"title": r["title"], "url": r["url"], "snippet": (r.get("content") or "")[:500]}
+            for r in results["results"][:5]
+        ]
+        return orjson.dumps(compact).decode()
+
+    # Create agent with temporal support; tools are registered on the wrapped
+    # agent, since TemporalAgent builds their activities when it is created
+    return TemporalAgent(
+        Agent(
+            _groq_model("instant"),
+            name="search_agent",
+            output_type=str,
+            system_prompt=SEARCH_SYSTEM_PROMPT,
+            model_settings=DETERMINISTIC_SETTINGS,
+            tools=[search_tool],
+        )
     )
-    agent.tool(search_tool, description="Search for information using Tavily")
 
-    return agent
 
-
-def create_analysis_agent() -> TemporalAgent:
+def create_analysis_agent(tier: ModelTier = "fast70b") -> TemporalAgent:
     """Create an analysis agent."""
-    agent = TemporalAgent(
-        "groq:llama-3.3-70b-versatile",
-        output_type=DeepResearchReport,
-        system_prompt="""You are an expert research analyst. Analyze search results and provide
-        comprehensive insights. Focus on accuracy, objectivity, and clear communication.
-        """,
+    return TemporalAgent(
+        Agent(
+            _groq_model(tier),
+            name=f"analysis_agent_{tier}",
+            output_type=DeepResearchReport,
+            system_prompt=ANALYSIS_SYSTEM_PROMPT,
+            model_settings=DETERMINISTIC_SETTINGS,
+        )
     )
-    return agent
 
 
 # Simple async runner (alternative to Temporal)
@@ -244,41 +481,39 @@ async def run_research_simple(topic: str) -> DeepResearchReport:
     """Run research without Temporal (for testing)."""
     # Create planning agent
     planning_agent = Agent(
-        "groq:llama-3.1-8b-instant",
+        _groq_model("instant"),
         output_type=ResearchPlan,
-        system_prompt="Generate 3-5 strategic search queries for comprehensive research.",
+        system_prompt=PLANNING_SYSTEM_PROMPT,
+        model_settings=DETERMINISTIC_SETTINGS,
     )
 
-    # Step 1: Plan
+    search_options = dict(search_depth="advanced", include_answer=True, max_results=5)
+
+    # Step 1: Plan, searching the raw topic while the planner runs
+    speculative = asyncio.ensure_future(_tavily_search(topic, **search_options))
     plan_result = await planning_agent.run(
         f"Create a research plan for: {topic}",
     )
     research_plan = plan_result.output
 
-    # Step 2: Parallel searches (Tavily search is sync, so use asyncio.to_thread)
-    search_client = TavilyClient()
-    async with asyncio.TaskGroup() as tg:
-        search_tasks = [
-            tg.create_task(
-                asyncio.to_thread(
-                    search_client.search,
-                    query=q.query,
-                    search_depth="advanced",
-                    include_answer=True,
-                    max_results=5,
-                )
-            )
-            for q in research_plan.queries
-        ]
+    # Step 2: Parallel searches, keeping the ones that succeeded in time
+    searches = {topic: speculative}
+    for q in research_plan.queries:
+        if q.query not in searches:
+            searches[q.query] = _tavily_search(q.query, **search_options)
+    responses = await _completed_within(searches, SEARCH_BATCH_DEADLINE)
 
-    # Collect results
-    all_results = [task.result() for task in search_tasks]
+    # Collect results, keeping one hit per URL across overlapping queries
+    all_results = list(
+        {r["url"]: r for response in responses for r in response["results"]}.values()
+    )
 
     # Step 3: Analyze
     analysis_agent = Agent(
-        "groq:llama-3.3-70b-versatile",
+        _groq_model("cached"),
         output_type=DeepResearchReport,
-        system_prompt="Analyze search results and create a comprehensive report.",
+        system_prompt=ANALYSIS_SYSTEM_PROMPT,
+        model_settings=DETERMINISTIC_SETTINGS,
     )
 
     report_result = await analysis_agent.run(
@@ -336,19 +571,20 @@ async def main():
         print(f"\nError: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        await _shared_http_client().aclose()
 
 
 # Temporal client setup (commented out - uncomment to use Temporal)
 async def run_with_temporal():
     """Run with Temporal server for durable execution."""
-    from datetime import timedelta
-
     # Start Temporal server first: temporal server start-dev
     print("Connecting to Temporal server at localhost:7233...")
-    client = await Client.connect("localhost:7233")
+    # Must match the worker's plugin so ResearchPlan round-trips as a model
+    client = await Client.connect("localhost:7233", plugins=[PydanticAIPlugin()])
 
     # Define workflow
-    workflow_id = f"deep-research-{int(asyncio.get_event_loop().time())}"
+    workflow_id = f"deep-research-{uuid.uuid4().hex[:12]}"
 
     # Use execute_workflow for simpler API
     print(f"Starting workflow (ID: {workflow_id})...")
@@ -373,6 +609,5 @@ async def run_with_temporal():
 
 if __name__ == "__main__":
     # Run simple version (works great!)
-    import asyncio
     print("Running Deep Research Agent (Simple Mode)...")
     asyncio.run(main())
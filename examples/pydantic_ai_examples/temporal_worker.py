@@ -8,13 +8,16 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'examples'))
 
 import temporalio
+from pydantic_ai.durable_exec.temporal import AgentPlugin, PydanticAIPlugin
 from temporalio.worker import Worker
 
 # Import workflows from different modules
 from workflows import ResearchWorkflow as SimpleWorkflow, research_activity as simple_activity
 from pydantic_ai_examples.deep_research_agent import (
     DeepResearchWorkflow,
+    planning_agent,
     search_activity,
+    search_batch_activity,
     analysis_activity as deep_analysis_activity,
 )
 
@@ -30,12 +33,22 @@ async def main():
     print("  - Deep Research Workflow (with Pydantic AI)")
     print()
 
-    # Create worker with all workflows and activities
+    # PydanticAIPlugin serializes payloads (e.g. SearchResult lists) with pydantic-core's
+    # Rust JSON encoder and lets pydantic_ai through the workflow sandbox
+    client = await temporalio.client.Client.connect("localhost:7233", plugins=[PydanticAIPlugin()])
+
+    # Create worker with all workflows and activities. The activities are I/O-bound
+    # LLM/search calls, so cap concurrency below the default to stay under Groq's
+    # rate limits while keeping enough pollers to pipeline the fan-out.
     worker = Worker(
-        client=await temporalio.client.Client.connect("localhost:7233"),
+        client,
         task_queue="research-tasks",
         workflows=[SimpleWorkflow, DeepResearchWorkflow],
-        activities=[simple_activity, search_activity, deep_analysis_activity],
+        activities=[simple_activity, search_activity, search_batch_activity, deep_analysis_activity],
+        plugins=[AgentPlugin(planning_agent)],
+        max_concurrent_activities=int(os.environ.get("TEMPORAL_MAX_CONCURRENT_ACTIVITIES", "32")),
+        max_concurrent_workflow_task_polls=int(os.environ.get("TEMPORAL_WORKFLOW_TASK_POLLS", "4")),
+        max_concurrent_activity_task_polls=int(os.environ.get("TEMPORAL_ACTIVITY_TASK_POLLS", "8")),
     )
 
     print("✓ Worker ready!")
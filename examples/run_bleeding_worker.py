@@ -1,5 +1,7 @@
 import asyncio
+import os
 import temporalio
+from temporalio.contrib.pydantic import pydantic_data_converter
 from temporalio.worker import Worker
 from bleeding_edge_research_final import (
     BleedingEdgeResearchWorkflow,
@@ -10,11 +12,15 @@ from bleeding_edge_research_final import (
 
 async def main():
     print("🔥 Starting Bleeding Edge Temporal Worker...")
+    client = await temporalio.client.Client.connect("localhost:7233", data_converter=pydantic_data_converter)
     worker = Worker(
-        client=await temporalio.client.Client.connect("localhost:7233"),
+        client,
         task_queue="research-tasks",
         workflows=[BleedingEdgeResearchWorkflow, BleedingEdgeOrchestrator],
         activities=[bleeding_edge_research_activity, generate_markdown_report_activity],
+        max_concurrent_activities=int(os.environ.get("TEMPORAL_MAX_CONCURRENT_ACTIVITIES", "32")),
+        max_concurrent_workflow_task_polls=int(os.environ.get("TEMPORAL_WORKFLOW_TASK_POLLS", "4")),
+        max_concurrent_activity_task_polls=int(os.environ.get("TEMPORAL_ACTIVITY_TASK_POLLS", "8")),
     )
     print("✅ Worker ready, listening for workflows...")
     await worker.run()
@@ -4,6 +4,7 @@ This shows how Temporal can survive crashes and resume execution.
 """
 
 import asyncio
+import uuid
 from temporalio.client import Client
 from datetime import timedelta
 
@@ -25,7 +26,7 @@ async def main():
     print()
 
     # Start workflow
-    workflow_id = f"research-workflow-{int(asyncio.get_event_loop().time())}"
+    workflow_id = f"research-workflow-{uuid.uuid4().hex[:12]}"
     print(f"Starting workflow (ID: {workflow_id})...")
     print()
 
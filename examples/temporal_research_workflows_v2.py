@@ -1,16 +1,29 @@
 """BLEEDING EDGE Temporal Research - June-November 2025 Only + Markdown Output"""
 
 import asyncio
-import json
+import hashlib
 import os
+import time
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import aiohttp
-from tavily import TavilyClient
+import orjson
 import temporalio
 from temporalio import workflow, activity
 from temporalio.client import Client
+from temporalio.common import RetryPolicy
+from temporalio.contrib.pydantic import pydantic_data_converter
 from datetime import timedelta
+from bleeding_edge_common import (
+    ALLOWED_MONTHS,
+    SAFE_FILENAME_TR,
+    TAVILY_SEM,
+    read_cache,
+    run,
+    tavily_sources,
+    write_bytes,
+    write_cache,
+)
 
 # Research topics for 20 Temporal workflows (BLEEDING EDGE)
 RESEARCH_TOPICS = [
@@ -37,69 +50,122 @@ RESEARCH_TOPICS = [
 ]
 
 
+# Concepts looked for in each topic's sources (matched case-insensitively)
+KEY_CONCEPTS = (
+    "Temporal workflows 2025",
+    "Durable execution",
+    "Agent orchestration 2025",
+    "Crash recovery",
+    "Multi-agent systems",
+    "AI agents 2025",
+    "Event sourcing",
+    "State management",
+    "Persistence",
+    "Coordination",
+    "LangGraph",
+    "Production deployment",
+    "Architecture patterns",
+    "Best practices",
+    "Case studies",
+)
+_KEY_CONCEPTS_LC = tuple(c.lower() for c in KEY_CONCEPTS)
+
+# Only the head of each source is scanned for concepts, bounding the work when
+# raw page content is large
+CONCEPT_SCAN_CHARS = 4096
+
+# Attempts Temporal makes at a research batch before it's accepted with some topics missing
+BATCH_MAX_ATTEMPTS = 3
+
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+_tavily_session: Optional[aiohttp.ClientSession] = None
+
+# Tavily responses are kept on disk so re-runs of the same topics skip the API
+TAVILY_CACHE_DIR = os.path.expanduser("~/.cache/firebird/tavily")
+
+
+def _cache_path(request: Dict[str, Any]) -> str:
+    """Cache file for a Tavily search, keyed on the full request body"""
+    key = orjson.dumps(request, option=orjson.OPT_SORT_KEYS)
+    return f"{TAVILY_CACHE_DIR}/{hashlib.sha256(key).hexdigest()}.json"
+
+
+def _tavily() -> aiohttp.ClientSession:
+    """Pooled Tavily session shared by every activity on this worker, created on first use"""
+    global _tavily_session
+    if _tavily_session is None or _tavily_session.closed:
+        _tavily_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=30),
+            headers={'Authorization': f"Bearer {os.environ['TAVILY_API_KEY']}"},
+            raise_for_status=True,
+        )
+    return _tavily_session
+
+
+async def close_tavily_session() -> None:
+    """Close the shared Tavily session (call on worker shutdown)"""
+    if _tavily_session is not None:
+        await _tavily_session.close()
+
+
 # Temporal Activities (the actual work)
 @activity.defn
 async def bleeding_edge_research_activity(topic: str) -> Dict[str, Any]:
     """Conduct BLEEDING EDGE research on a topic using Tavily (June-Nov 2025 only)"""
     print(f"[Temporal Activity] 🔥 Bleeding Edge Research: {topic}")
+    return await _research(topic)
+
 
+@activity.defn
+async def batch_research_activity(topics: List[str]) -> List[Dict[str, Any]]:
+    """Research several topics concurrently in one activity
+
+    If any topic fails the activity raises so Temporal retries the batch (topics that
+    succeeded come back from the disk cache); on the last attempt the failed topics
+    are skipped instead.
+    """
+    print(f"[Temporal Activity] 🔥 Bleeding Edge Research: {len(topics)} topics")
+    outcomes = await asyncio.gather(*[_research(t) for t in topics], return_exceptions=True)
+    failed = [t for t, r in zip(topics, outcomes) if isinstance(r, BaseException)]
+    if failed:
+        activity.logger.warning("Research failed for %d topics: %s", len(failed), failed)
+        if activity.info().attempt < BATCH_MAX_ATTEMPTS:
+            raise RuntimeError(f"Research failed for {len(failed)} of {len(topics)} topics")
+    return [r for r in outcomes if not isinstance(r, BaseException)]
+
+
+async def _research(topic: str) -> Dict[str, Any]:
     # Search for information (with date filter for June-Nov 2025)
-    tavily_client = TavilyClient()
-    results = await asyncio.to_thread(
-        tavily_client.search,
-        query=topic,
-        search_depth="advanced",
-        include_answer=True,
-        include_raw_content=True,
-        max_results=15,  # More sources for bleeding edge
-        time_range="month"  # Last month (very recent)
-    )
+    request = {
+        'query': topic,
+        'search_depth': "advanced",
+        'include_answer': True,
+        'include_raw_content': True,
+        'max_results': 15,  # More sources for bleeding edge
+        'time_range': "month",  # Last month (very recent)
+    }
+    cache_path = _cache_path(request)
+    results = await asyncio.to_thread(read_cache, cache_path)
+    if results is None:
+        async with TAVILY_SEM, _tavily().post(TAVILY_SEARCH_URL, json=request) as response:
+            raw = await response.read()
+        results = orjson.loads(raw)
+        await asyncio.to_thread(write_cache, cache_path, raw)
 
     # Extract sources
-    sources = [
-        {
-            'title': r['title'],
-            'url': r['url'],
-            'content': r.get('content', r.get('snippet', '')),
-            'query': topic,
-            'published_date': r.get('published_date', 'N/A')  # Get publication date
-        }
-        for r in results.get('results', [])
-    ]
+    sources = tavily_sources(results, topic)
 
     # Filter for June-November 2025
-    filtered_sources = []
-    for source in sources:
-        date_str = source.get('published_date', '')
-        # Filter for June-November 2025
-        if '2025-06' in date_str or '2025-07' in date_str or '2025-08' in date_str or \
-           '2025-09' in date_str or '2025-10' in date_str or '2025-11' in date_str:
-            filtered_sources.append(source)
+    filtered_sources = [s for s in sources if s.get('published_date', '')[:7] in ALLOWED_MONTHS]
 
     # If no dated sources, keep all (sometimes dates aren't available)
     if not filtered_sources:
         filtered_sources = sources[:10]  # Keep top 10
 
     # Analyze
-    all_content = ' '.join([s['content'] for s in filtered_sources[:10]])
-    key_concepts = [
-        "Temporal workflows 2025",
-        "Durable execution",
-        "Agent orchestration 2025",
-        "Crash recovery",
-        "Multi-agent systems",
-        "AI agents 2025",
-        "Event sourcing",
-        "State management",
-        "Persistence",
-        "Coordination",
-        "LangGraph",
-        "Production deployment",
-        "Architecture patterns",
-        "Best practices",
-        "Case studies"
-    ]
-    found_concepts = [c for c in key_concepts if c.lower() in all_content.lower()]
+    content_lc = ' '.join(s['content'][:CONCEPT_SCAN_CHARS].lower() for s in filtered_sources[:10])
+    found_concepts = [c for c, c_lc in zip(KEY_CONCEPTS, _KEY_CONCEPTS_LC) if c_lc in content_lc]
 
     return {
         'topic': topic,
@@ -107,7 +173,7 @@ async def bleeding_edge_research_activity(topic: str) -> Dict[str, Any]:
         'key_concepts': found_concepts,
         'total_sources': len(filtered_sources),
         'concepts_found': len(found_concepts),
-        'coverage': len(found_concepts) / len(key_concepts),
+        'coverage': len(found_concepts) / len(KEY_CONCEPTS),
         'timestamp': datetime.now().isoformat(),
         'date_filter': 'June-November 2025',
         'raw_count': len(sources),
@@ -122,7 +188,7 @@ async def generate_markdown_report_activity(research_data: Dict[str, Any]) -> st
     print(f"[Temporal Activity] 📝 Generating Markdown report: {topic[:50]}...")
 
     # Create markdown report
-    md_content = f"""# 🔥 BLEEDING EDGE Research: {topic}
+    parts = [f"""# 🔥 BLEEDING EDGE Research: {topic}
 
 **Generated**: {research_data['timestamp']}
 **Research Period**: {research_data['date_filter']}
@@ -138,31 +204,28 @@ async def generate_markdown_report_activity(research_data: Dict[str, Any]) -> st
 
 ## 🎯 Key Findings
 
-"""
+"""]
 
     # Add key findings
-    for i, finding in enumerate(research_data['key_findings'], 1):
-        md_content += f"{i}. {finding}\n"
+    parts.extend(f"{i}. {finding}\n" for i, finding in enumerate(research_data['key_findings'], 1))
 
-    md_content += f"""
+    parts.append("""
 ---
 
 ## 🔑 Key Concepts Identified
 
-"""
+""")
     # Add key concepts
-    for concept in research_data['key_concepts']:
-        md_content += f"- **{concept}**\n"
+    parts.extend(f"- **{concept}**\n" for concept in research_data['key_concepts'])
 
-    md_content += f"""
+    parts.append("""
 ---
 
 ## 📚 Top Sources (June-Nov 2025)
 
-"""
+""")
     # Add top sources
-    for i, source in enumerate(research_data['sources'][:5], 1):
-        md_content += f"""### {i}. {source['title']}
+    parts.extend(f"""### {i}. {source['title']}
 
 **URL**: [{source['url']}]({source['url']})
 **Published**: {source.get('published_date', 'N/A')}
@@ -171,17 +234,16 @@ async def generate_markdown_report_activity(research_data: Dict[str, Any]) -> st
 
 ---
 
-"""
+""" for i, source in enumerate(research_data['sources'][:5], 1))
 
-    md_content += f"""
+    parts.append("""
 ## 💡 Recommendations
 
-"""
+""")
     # Add recommendations
-    for i, rec in enumerate(research_data['recommendations'], 1):
-        md_content += f"{i}. {rec}\n"
+    parts.extend(f"{i}. {rec}\n" for i, rec in enumerate(research_data['recommendations'], 1))
 
-    md_content += f"""
+    parts.append(f"""
 ---
 
 ## 🚀 Next Steps
@@ -208,15 +270,15 @@ Based on this bleeding edge research:
 
 *This report was generated autonomously by Firebird's Temporal-powered research agents.*
 *For more information, see: https://github.com/adaptnova/firebird*
-"""
+""")
+    md_content = "".join(parts)
 
     # Save report (markdown format)
-    safe_filename = topic.replace(' ', '_').replace('/', '_').replace(':', '_')[:50]
+    safe_filename = topic.translate(SAFE_FILENAME_TR)[:50]
     md_path = f"/adapt/projects/firebird/reports/{safe_filename}.md"
 
     os.makedirs(os.path.dirname(md_path), exist_ok=True)
-    with open(md_path, 'w') as f:
-        f.write(md_content)
+    await asyncio.to_thread(write_bytes, md_path, md_content.encode())
 
     print(f"[Temporal Activity] ✅ Saved Markdown: {safe_filename}.md")
     return md_path
@@ -228,8 +290,8 @@ class BleedingEdgeResearchWorkflow:
     """Temporal workflow for BLEEDING EDGE research"""
 
     @workflow.run
-    async def run(self, topic: str) -> str:
-        """Execute bleeding edge research workflow"""
+    async def run(self, topic: str) -> Tuple[str, List[str]]:
+        """Execute bleeding edge research workflow, returning the report path and its key concepts"""
         print(f"[Temporal Workflow] 🔥 Starting Bleeding Edge research: {topic}")
 
         # Execute research activity (with date filter)
@@ -237,7 +299,7 @@ class BleedingEdgeResearchWorkflow:
             bleeding_edge_research_activity,
             topic,
             start_to_close_timeout=timedelta(minutes=3),
-            retry_policy=workflow.RetryPolicy(
+            retry_policy=RetryPolicy(
                 initial_interval=timedelta(seconds=1),
                 maximum_interval=timedelta(seconds=15),
                 backoff_coefficient=2.0,
@@ -245,15 +307,16 @@ class BleedingEdgeResearchWorkflow:
             )
         )
 
-        # Generate markdown report
-        report_path = await workflow.execute_activity(
+        # Generate markdown report (a local activity: it's short and idempotent,
+        # so it can skip the round trip through the server)
+        report_path = await workflow.execute_local_activity(
             generate_markdown_report_activity,
             research_data,
-            start_to_close_timeout=timedelta(minutes=1),
+            start_to_close_timeout=timedelta(seconds=30),
         )
 
         print(f"[Temporal Workflow] ✅ Completed: {topic[:50]}...")
-        return report_path
+        return report_path, research_data['key_concepts']
 
 
 @workflow.defn
@@ -261,50 +324,63 @@ class BleedingEdgeOrchestrator:
     """Orchestrate multiple BLEEDING EDGE research workflows"""
 
     @workflow.run
-    async def run_all(self, topics: List[str]) -> List[str]:
-        """Execute all research workflows in parallel"""
+    async def run_all(self, topics: List[str]) -> List[Tuple[str, List[str]]]:
+        """Execute all research workflows in parallel, returning each report path and its key concepts"""
         print(f"[Orchestrator] 🔥 Launching {len(topics)} BLEEDING EDGE research workflows...")
         print(f"[Orchestrator] 📅 Date Filter: June-November 2025 ONLY")
 
-        # Execute all workflows in parallel using TaskGroup
-        async with workflow.TaskGroup() as tg:
-            tasks = [
-                tg.create_task(
-                    workflow.execute_child_workflow(
-                        "BleedingEdgeResearchWorkflow",
-                        topic,
-                        id=f"bleeding-edge-{i}-{topic.replace(' ', '_')[:20]}",
-                        task_queue="research-tasks",
-                        start_to_close_timeout=timedelta(minutes=5),
-                    )
+        # Search every topic in one activity, rather than a child workflow per topic
+        research = await workflow.execute_activity(
+            batch_research_activity,
+            topics,
+            start_to_close_timeout=timedelta(minutes=5),
+            retry_policy=RetryPolicy(
+                initial_interval=timedelta(seconds=1),
+                maximum_interval=timedelta(seconds=15),
+                backoff_coefficient=2.0,
+                maximum_attempts=BATCH_MAX_ATTEMPTS,
+            )
+        )
+
+        # Write the reports in parallel; a failed report doesn't cancel its siblings
+        outcomes = await asyncio.gather(
+            *[
+                workflow.execute_local_activity(
+                    generate_markdown_report_activity,
+                    research_data,
+                    start_to_close_timeout=timedelta(seconds=30),
                 )
-                for i, topic in enumerate(topics, 1)
-            ]
+                for research_data in research
+            ],
+            return_exceptions=True,
+        )
 
-        # Collect results
-        results = [task.result() for task in tasks]
+        # Collect results from the topics that succeeded
+        results = [
+            (report_path, research_data['key_concepts'])
+            for research_data, report_path in zip(research, outcomes)
+            if not isinstance(report_path, BaseException)
+        ]
+        if len(results) < len(topics):
+            print(f"[Orchestrator] ⚠️ {len(topics) - len(results)} workflows failed")
 
         print(f"[Orchestrator] ✅ All {len(results)} BLEEDING EDGE workflows completed!")
         return results
 
 
-async def generate_executive_markdown_report(workflow_results: List[str]):
-    """Generate executive summary in Markdown"""
+async def generate_executive_markdown_report(workflow_results: List[Tuple[str, List[str]]]):
+    """Generate executive summary in Markdown from each workflow's (report path, key concepts)"""
     print("\n📋 Generating Executive Markdown Summary...")
 
     # Collect all reports
     all_sources = []
-    all_concepts = []
+    all_concepts: Dict[str, None] = {}  # insertion-ordered set
     all_findings = []
 
-    for result_path in workflow_results:
-        if os.path.exists(result_path):
-            with open(result_path, 'r') as f:
-                content = f.read()
-                # Extract concepts
-                concepts_section = content.split("## 🔑 Key Concepts Identified")[1].split("---")[0] if "## 🔑 Key Concepts" in content else ""
-                concepts = [line.strip('- *').strip() for line in concepts_section.split('\n') if line.strip().startswith('-')]
-                all_concepts.extend(concepts)
+    # The workflows return their concepts, so the reports don't need reading back
+    for _report_path, concepts in workflow_results:
+        for concept in concepts:
+            all_concepts.setdefault(concept, None)
 
     # Create executive summary
     exec_summary = f"""# 🔥 FIREBIRD AUTONOMOUS RESEARCH EXECUTIVE SUMMARY
@@ -331,7 +407,7 @@ The following concepts emerged across all research areas:
 """
 
     # Add unique concepts
-    unique_concepts = list(set(all_concepts))
+    unique_concepts = list(all_concepts)
     for concept in unique_concepts[:20]:  # Top 20
         exec_summary += f"- **{concept}**\n"
 
@@ -414,8 +490,7 @@ Each report includes:
 
     # Save executive summary
     exec_path = "/adapt/projects/firebird/reports/EXECUTIVE_SUMMARY.md"
-    with open(exec_path, 'w') as f:
-        f.write(exec_summary)
+    await asyncio.to_thread(write_bytes, exec_path, exec_summary.encode())
 
     print(f"✅ Executive summary saved: {exec_path}")
     return exec_path
@@ -432,7 +507,7 @@ async def run_bleeding_edge_research_swarm():
 
     # Connect to Temporal server
     print("📡 Connecting to Temporal server...")
-    client = await Client.connect("localhost:7233")
+    client = await Client.connect("localhost:7233", data_converter=pydantic_data_converter)
     print("✅ Connected!")
     print()
 
@@ -442,20 +517,20 @@ async def run_bleeding_edge_research_swarm():
     print(f"📄 Output Format: Markdown (.md)")
     print()
 
-    start_time = datetime.now()
+    start_time = time.perf_counter()
 
     handle = await client.start_workflow(
         "BleedingEdgeOrchestrator.run_all",
         RESEARCH_TOPICS,
         id="bleeding-edge-orchestrator-2025",
         task_queue="research-tasks",
-        start_to_close_timeout=timedelta(minutes=15),
+        execution_timeout=timedelta(minutes=15),
     )
 
     print("⏳ Waiting for all BLEEDING EDGE workflows to complete...")
     results = await handle.result()
 
-    duration = (datetime.now() - start_time).total_seconds()
+    duration = time.perf_counter() - start_time
 
     # Generate executive summary
     exec_path = await generate_executive_markdown_report(results)
@@ -477,4 +552,4 @@ async def run_bleeding_edge_research_swarm():
 
 
 if __name__ == "__main__":
-    asyncio.run(run_bleeding_edge_research_swarm())
+    run(run_bleeding_edge_research_swarm())
@@ -4,7 +4,7 @@ import asyncio
 from temporalio.client import Client
 
 
-async def recover_workflow(workflow_id: str):
+async def recover_workflow(client: Client, workflow_id: str):
     """Recover and complete a workflow that was started earlier."""
     print("=" * 80)
     print("TEMPORAL DURABILITY TEST")
@@ -13,9 +13,6 @@ async def recover_workflow(workflow_id: str):
     print(f"Attempting to recover workflow: {workflow_id}")
     print()
 
-    # Connect to Temporal
-    client = await Client.connect("localhost:7233")
-
     # Get the workflow handle
     handle = client.get_workflow_handle(workflow_id)
 
@@ -35,10 +32,8 @@ async def recover_workflow(workflow_id: str):
     print("✓ Workflow successfully recovered and completed!")
 
 
-async def list_workflows():
+async def list_workflows(client: Client):
     """List recent workflows."""
-    client = await Client.connect("localhost:7233")
-
     print("Recent workflows:")
     async for workflow in client.list_workflows(limit=5):
         print(f"  - ID: {workflow.id}")
@@ -50,8 +45,11 @@ async def list_workflows():
 
 async def main():
     """Main function."""
+    # Connect to Temporal once for both steps
+    client = await Client.connect("localhost:7233")
+
     # List workflows
-    await list_workflows()
+    await list_workflows(client)
 
     # Recover the most recent workflow
     import sys
@@ -60,7 +58,7 @@ async def main():
     else:
         workflow_id = "research-workflow-17110"
 
-    await recover_workflow(workflow_id)
+    await recover_workflow(client, workflow_id)
 
 
 if __name__ == "__main__":